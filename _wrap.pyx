@@ -0,0 +1,56 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled version of wrap_text from pdf-to-llm.py.
+
+Build in place with ``cythonize -i _wrap.pyx``; pdf-to-llm.py falls back to
+its pure Python implementation when this extension is not available.
+"""
+
+cdef void _wrap_paragraph(str paragraph, Py_ssize_t width, list lines):
+    # Split on any whitespace, like the Python version, so words end up
+    # separated by single spaces and indentation is dropped
+    cdef list words = paragraph.split()
+    cdef Py_ssize_t n = len(words)
+    cdef Py_ssize_t i
+    cdef Py_ssize_t line_start = 0
+    cdef Py_ssize_t line_length = 0
+    cdef Py_ssize_t word_length
+
+    for i in range(n):
+        word_length = len(<str>words[i])
+        if i == line_start:
+            line_length = word_length
+        elif line_length + 1 + word_length > width:
+            # Word does not fit, so emit the current line and start a new one
+            lines.append(' '.join(words[line_start:i]))
+            line_start = i
+            line_length = word_length
+        else:
+            line_length += 1 + word_length
+
+    if n:
+        lines.append(' '.join(words[line_start:]))
+
+def wrap_text(str text, Py_ssize_t width=80):
+    """Wrap text to specified width while preserving paragraphs.
+
+    The width is validated by the wrap_text wrapper in pdf-to-llm.py.
+    """
+    cdef list wrapped_paragraphs = []
+    cdef str paragraph
+    cdef str stripped
+
+    for paragraph in text.split('\n'):
+        stripped = paragraph.strip()
+        if not stripped:
+            wrapped_paragraphs.append('')
+            continue
+
+        # Preserve page markers
+        if stripped.startswith('[Page'):
+            wrapped_paragraphs.append(paragraph)
+            continue
+
+        # Wrap long paragraphs
+        _wrap_paragraph(paragraph, width, wrapped_paragraphs)
+
+    return '\n'.join(wrapped_paragraphs)
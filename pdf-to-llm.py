@@ -1,14 +1,72 @@
 import PyPDF2
 import os
 import re
+import textwrap
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 import yaml
-from typing import Dict, Union
-import referia as rf
-import pandas as pd
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader, SafeDumper
+from typing import Dict, Tuple, Union
+try:
+    from _wrap import wrap_text as _compiled_wrap_text
+except ImportError:  # Cython extension not built
+    _compiled_wrap_text = None
+
+# Patterns used by clean_text, compiled once rather than on every page
+_WS_RE = re.compile(r'\s+')
+# Runs of whitespace and/or disallowed characters, split on whether they are
+# directly followed by punctuation, so that clean_text needs a single pass
+_SPECIAL_WS_RE = re.compile(
+    r'(?P<before_punct>[^\w.,!?;:()-]+(?=[.,!?;:]))|[^\w.,!?;:()-]+')
+
+# For ASCII text the special character filter is a plain translation table:
+# everything _SPECIAL_WS_RE would keep (word characters, whitespace and basic
+# punctuation) stays and all other ASCII characters are deleted
+_ASCII_ALLOWED_RE = re.compile(r'[\w\s.,!?;:()-]')
+_ASCII_DELETE = {i: None for i in range(128)
+                 if not _ASCII_ALLOWED_RE.match(chr(i))}
+# Single space before punctuation once whitespace has been normalized
+_SPACE_PUNCT_RE = re.compile(r' (?=[.,!?;:])')
+
+def _replace_special_ws(match):
+    """Replacement for a run matched by _SPECIAL_WS_RE."""
+    # Nothing is kept before punctuation, a run containing whitespace becomes
+    # a single space and anything else is removed
+    if match.lastgroup == 'before_punct':
+        return ''
+    return ' ' if _WS_RE.search(match.group()) else ''
+
+# Shared wrapper for the default 80 character width used by clean_text
+_WRAPPER = textwrap.TextWrapper(width=80, break_long_words=False,
+                                break_on_hyphens=False)
+
+# PyPDF2 issues many small seeks and reads, so give input files a large buffer
+_READ_BUFFER_SIZE = 1 << 20
+# Text output is written page by page through a buffer of the same size
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Parsed section config files keyed by path, validated against (mtime, size)
+_YAML_CACHE: 'OrderedDict[str, Tuple[int, int, Dict]]' = OrderedDict()
+MAX_CACHE = 100
+
+_ROMAN_SYMBOLS = (
+    ('M', 1000), ('CM', 900), ('D', 500), ('CD', 400),
+    ('C', 100), ('XC', 90), ('L', 50), ('XL', 40),
+    ('X', 10), ('IX', 9), ('V', 5), ('IV', 4), ('I', 1)
+)
+# Lowercase numerals already produced by PageNumbering._to_roman
+_ROMAN_CACHE: Dict[int, str] = {}
 
 def generate_thesis_config(data, index: str) -> Dict:
     """Generate thesis configuration from Referia data."""
+    # Imported here so the PDF conversion functions don't pull in pandas
+    import pandas as pd
+    
     config = {}
     
     # Map of section names to their Referia column prefixes
@@ -23,38 +81,45 @@ def generate_thesis_config(data, index: str) -> Dict:
         'index': 'Index'
     }
     
+    # Pull the thesis row out once rather than looking up each cell. Referia
+    # returns a one-row CustomDataFrame from .loc, so flatten it via pandas
+    row = data.loc[index].to_pandas().iloc[0].to_dict()
+    
     # Add chapter configurations
     for i in range(1, 13):  # Chapters 1-12
         chapter_key = f'chapter_{i}'
         prefix = f'Ch{i}'
-        present = data.at[index, f'{prefix}Present']
+        present = row.get(f'{prefix}Present')
         if pd.notna(present) and present:
+            first_page = row[f'{prefix}FP']
+            last_page = row[f'{prefix}LP']
             try:
                 config[chapter_key] = {
-                    'start_page': int(data.at[index, f'{prefix}FP']),
-                    'end_page': int(data.at[index, f'{prefix}LP']),
+                    'start_page': int(first_page),
+                    'end_page': int(last_page),
                     'roman': False
                 }
             except ValueError:
                 raise ValueError(f"Invalid page numbers for Chapter {i} (Present={present}). "
-                               f"Expected integers for start page ({data.at[index, f'{prefix}FP']}) "
-                               f"and end page ({data.at[index, f'{prefix}LP']})")
+                               f"Expected integers for start page ({first_page}) "
+                               f"and end page ({last_page})")
     # Add other sections
     for config_key, prefix in section_mappings.items():
-        present = data.at[index, f'{prefix}Present']
+        present = row.get(f'{prefix}Present')
         if pd.notna(present) and present:
             config[config_key] = {
-                'start_page': int(data.at[index, f'{prefix}FP']),
-                'end_page': int(data.at[index, f'{prefix}LP']),
+                'start_page': int(row[f'{prefix}FP']),
+                'end_page': int(row[f'{prefix}LP']),
                 'roman': config_key in ['abstract', 'acknowledgments', 'toc']  # Front matter uses roman numerals
             }
     return config
 
-def split_pdf(pdf_path: str, output_dir: str, config: Dict):
-    """Split PDF into sections based on configuration."""
-    reader = PyPDF2.PdfReader(os.path.join(os.path.expanduser("~/Documents"), pdf_path))
-    
-    for section_name, section_config in config.items():
+def _write_section(input_path: str, output_dir: str, section_name: str,
+                   section_config: Dict):
+    """Write the pages of one section to its own PDF file."""
+    # Each worker opens its own reader, as a PdfReader cannot be pickled
+    with open(input_path, 'rb', buffering=_READ_BUFFER_SIZE) as input_file:
+        reader = PyPDF2.PdfReader(input_file)
         writer = PyPDF2.PdfWriter()
         start_page = section_config['start_page'] - 1  # Convert to 0-based index
         end_page = section_config['end_page']
@@ -63,15 +128,39 @@ def split_pdf(pdf_path: str, output_dir: str, config: Dict):
             if page_num < len(reader.pages):
                 writer.add_page(reader.pages[page_num])
         
-        # Create output directory if it doesn't exist
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
         output_path = os.path.join(output_dir, f"{section_name}.pdf")
         
         with open(output_path, 'wb') as output_file:
             writer.write(output_file)
 
+def split_pdf(pdf_path: str, output_dir: str, config: Dict):
+    """Split PDF into sections based on configuration."""
+    input_path = os.path.join(os.path.expanduser("~/Documents"), pdf_path)
+    
+    # Create output directory if it doesn't exist
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    # Sections are independent, so write them in parallel
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(_write_section, repeat(input_path), repeat(output_dir),
+                          config.keys(), config.values(), chunksize=1))
+
 def wrap_text(text, width=80):
-    """Wrap text to specified width while preserving paragraphs."""
+    """Wrap text to specified width while preserving paragraphs.
+    
+    Words are separated by single spaces, so runs of whitespace (including
+    tabs) and leading indentation are collapsed.
+    """
+    if width <= 0:
+        raise ValueError(f"invalid width {width!r} (must be > 0)")
+    if _compiled_wrap_text is not None:
+        return _compiled_wrap_text(text, width)
+    
+    if width == _WRAPPER.width:
+        wrapper = _WRAPPER
+    else:
+        wrapper = textwrap.TextWrapper(width=width, break_long_words=False,
+                                       break_on_hyphens=False)
     paragraphs = text.split('\n')
     wrapped_paragraphs = []
     
@@ -86,35 +175,30 @@ def wrap_text(text, width=80):
             continue
             
         # Wrap long paragraphs
-        current_line = []
-        current_length = 0
-        
-        for word in paragraph.split():
-            word_length = len(word) + 1  # +1 for space
-            if current_length + word_length > width:
-                wrapped_paragraphs.append(' '.join(current_line))
-                current_line = [word]
-                current_length = word_length
-            else:
-                current_line.append(word)
-                current_length += word_length
-                
-        if current_line:
-            wrapped_paragraphs.append(' '.join(current_line))
+        wrapped_paragraphs.extend(wrapper.wrap(' '.join(paragraph.split())))
             
     return '\n'.join(wrapped_paragraphs)
 
 def clean_text(text):
     """Clean and normalize text content."""
-    # Remove extra whitespace and normalize line endings
-    text = re.sub(r'\s+', ' ', text)
-    # Remove special characters but keep basic punctuation
-    text = re.sub(r'[^\w\s.,!?;:()-]', '', text)
-    # Fix spacing around punctuation
-    text = re.sub(r'\s+([.,!?;:])', r'\1', text)
+    # Blank pages are common between chapters, nothing to clean
+    if not text or text.isspace():
+        return ''
+    
+    if text.isascii():
+        # Remove special characters (keeping basic punctuation), normalize
+        # whitespace and fix spacing around punctuation
+        text = ' '.join(text.translate(_ASCII_DELETE).split())
+        text = _SPACE_PUNCT_RE.sub('', text)
+    else:
+        # Same steps in one pass, with full Unicode \w semantics
+        text = _SPECIAL_WS_RE.sub(_replace_special_ws, text)
+    text = text.strip()
+    # Text that already fits on one line needs no wrapping
+    if len(text) <= _WRAPPER.width:
+        return text
     # Wrap text to 80 characters
-    text = wrap_text(text.strip())
-    return text
+    return wrap_text(text)
 
 class PageNumbering:
     def __init__(self, start_page: int, is_roman: bool = False):
@@ -130,23 +214,21 @@ class PageNumbering:
 
     @staticmethod
     def _to_roman(num: int) -> str:
-        roman_symbols = [
-            ('M', 1000), ('CM', 900), ('D', 500), ('CD', 400),
-            ('C', 100), ('XC', 90), ('L', 50), ('XL', 40),
-            ('X', 10), ('IX', 9), ('V', 5), ('IV', 4), ('I', 1)
-        ]
-        result = ''
-        for symbol, value in roman_symbols:
-            while num >= value:
-                result += symbol
-                num -= value
-        return result.lower()  # Convert to lowercase for conventional thesis numbering
+        cached = _ROMAN_CACHE.get(num)
+        if cached is not None:
+            return cached
+        parts = []
+        remainder = max(num, 0)
+        for symbol, value in _ROMAN_SYMBOLS:
+            count, remainder = divmod(remainder, value)
+            if count:
+                parts.append(symbol * count)
+        result = ''.join(parts).lower()  # Convert to lowercase for conventional thesis numbering
+        _ROMAN_CACHE[num] = result
+        return result
 
-def load_section_config(config_path: str) -> Dict[str, PageNumbering]:
-    """Load section configurations from YAML file."""
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-    
+def build_section_config(config: Dict) -> Dict[str, PageNumbering]:
+    """Build section page numbering from a configuration dictionary."""
     section_configs = {}
     for section, details in config.items():
         start_page = details.get('start_page', 1)
@@ -155,6 +237,69 @@ def load_section_config(config_path: str) -> Dict[str, PageNumbering]:
     
     return section_configs
 
+def load_section_config(config_path: str) -> Dict[str, PageNumbering]:
+    """Load section configurations from YAML file.
+    
+    Parsed files are cached and only re-read when their mtime or size changes.
+    """
+    stat = os.stat(config_path)
+    cached = _YAML_CACHE.get(config_path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        _YAML_CACHE.move_to_end(config_path)
+        config = cached[2]
+    else:
+        with open(config_path, 'r') as f:
+            config = yaml.load(f, Loader=SafeLoader)
+        _YAML_CACHE[config_path] = (stat.st_mtime_ns, stat.st_size, config)
+        _YAML_CACHE.move_to_end(config_path)
+        if len(_YAML_CACHE) > MAX_CACHE:
+            _YAML_CACHE.popitem(last=False)
+    
+    # The cached dict is only read here, so it is never handed out directly
+    return build_section_config(config)
+
+def pdf_reader_to_txt(pdf_reader, page_range: slice, output_dir, base_name: str,
+                      page_numbering: PageNumbering, is_toc: bool = False) -> str:
+    """Convert a range of pages from an open PDF reader to a cleaned text file.
+    
+    The table of contents (is_toc) is written without page markers.
+    """
+    pages = pdf_reader.pages[page_range]
+    
+    # Precompute the page markers using the configured page numbering
+    num_pages = len(pages)
+    if is_toc:
+        page_markers = [''] * num_pages
+    else:
+        page_markers = [f"\n[Page {page_numbering.get_page_string(page_num)}]\n"
+                        for page_num in range(num_pages)]
+    
+    # Write each page out as it is extracted and cleaned, to a temporary file
+    # that only replaces the output once every page has been converted
+    output_path = os.path.join(output_dir, f"{base_name}.txt")
+    temp_path = output_path + '.tmp'
+    try:
+        with open(temp_path, 'w', encoding='utf-8',
+                  buffering=_WRITE_BUFFER_SIZE) as out_file:
+            for page_num, page in enumerate(pages):
+                text = page.extract_text()
+                cleaned_text = clean_text(text)
+                
+                # Pages are newline separated (no need for additional
+                # spacing since we have page markers)
+                if page_num:
+                    out_file.write('\n')
+                out_file.write(page_markers[page_num])
+                out_file.write(cleaned_text)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        # Never leave a truncated text file behind
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    
+    return output_path
+
 def pdf_to_txt(pdf_path, output_dir, section_configs: Dict[str, PageNumbering]):
     """Convert a PDF file to cleaned text format with proper page numbering."""
     # Create output directory if it doesn't exist
@@ -162,63 +307,93 @@ def pdf_to_txt(pdf_path, output_dir, section_configs: Dict[str, PageNumbering]):
     
     # Get base filename without extension
     base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    lower_name = base_name.lower()
     
     # Get the appropriate page numbering configuration
-    page_numbering = section_configs.get(base_name.lower(), 
+    page_numbering = section_configs.get(lower_name, 
                                        PageNumbering(1, False))  # Default to arabic starting at 1
     
     try:
         # Open PDF file
-        with open(pdf_path, 'rb') as file:
+        with open(pdf_path, 'rb', buffering=_READ_BUFFER_SIZE) as file:
             # Create PDF reader object
             pdf_reader = PyPDF2.PdfReader(file)
-            
-            # Extract and clean text
-            full_text = []
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text = page.extract_text()
-                cleaned_text = clean_text(text)
-                
-                if base_name.lower() == 'toc':
-                    full_text.append(cleaned_text)
-                else:
-                    # Use the configured page numbering
-                    page_string = page_numbering.get_page_string(page_num)
-                    page_marker = f"\n[Page {page_string}]\n"
-                    full_text.append(page_marker + cleaned_text)
-            
-            # Combine all pages (no need for additional spacing since we have page markers)
-            final_text = '\n'.join(full_text)
-            
-            # Write to output file
-            output_path = os.path.join(output_dir, f"{base_name}.txt")
-            with open(output_path, 'w', encoding='utf-8') as out_file:
-                out_file.write(final_text)
-            
-            return output_path
+            return pdf_reader_to_txt(pdf_reader, slice(None), output_dir,
+                                     base_name, page_numbering,
+                                     is_toc=lower_name == 'toc')
             
     except Exception as e:
         print(f"Error processing {pdf_path}: {str(e)}")
         return None
+
+def sections_to_txt(pdf_path: str, output_dir: str, config: Dict,
+                    section_configs: Dict[str, PageNumbering]):
+    """Convert each configured section of a PDF straight to a text file.
+    
+    The PDF is parsed once and no intermediate per-section PDFs are written.
+    """
+    input_path = os.path.join(os.path.expanduser("~/Documents"), pdf_path)
+    
+    # Create output directory if it doesn't exist
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    
+    with open(input_path, 'rb', buffering=_READ_BUFFER_SIZE) as input_file:
+        reader = PyPDF2.PdfReader(input_file)
+        
+        for section_name, section_config in config.items():
+            # Convert to 0-based index
+            page_range = slice(section_config['start_page'] - 1,
+                               section_config['end_page'])
+            try:
+                output_path = pdf_reader_to_txt(reader, page_range, output_dir,
+                                                section_name,
+                                                section_configs[section_name],
+                                                is_toc=section_name.lower() == 'toc')
+                print(f"Successfully converted {section_name} to {output_path}")
+            except Exception as e:
+                print(f"Failed to convert {section_name}: {str(e)}")
     
-def process_directory(input_dir, output_dir, config_path):
-    """Process all PDF files in a directory using the specified configuration."""
-    # Load section configurations
-    section_configs = load_section_config(config_path)
+def process_directory(input_dir, output_dir, config_path: str = None,
+                      section_configs: Dict[str, PageNumbering] = None):
+    """Process all PDF files in a directory using the specified configuration.
     
-    pdf_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.pdf')]
+    Page numbering comes from section_configs if given, otherwise it is
+    loaded from the YAML file at config_path.
+    """
+    if section_configs is None:
+        if config_path is None:
+            raise ValueError("Either config_path or section_configs must be provided")
+        # Load section configurations
+        section_configs = load_section_config(config_path)
     
-    for pdf_file in pdf_files:
-        pdf_path = os.path.join(input_dir, pdf_file)
-        output_path = pdf_to_txt(pdf_path, output_dir, section_configs)
+    with os.scandir(input_dir) as entries:
+        pdf_entries = [entry for entry in entries
+                       if entry.is_file() and entry.name.lower().endswith('.pdf')]
+    pdf_files = [entry.name for entry in pdf_entries]
+    pdf_paths = [entry.path for entry in pdf_entries]
+    
+    # Each PDF is converted independently, so spread them across processes
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        output_paths = executor.map(pdf_to_txt, pdf_paths, repeat(output_dir),
+                                    repeat(section_configs), chunksize=1)
+        results = list(zip(pdf_files, output_paths))
+    
+    for pdf_file, output_path in results:
         if output_path:
             print(f"Successfully converted {pdf_file} to {output_path}")
         else:
             print(f"Failed to convert {pdf_file}")
 
-def main():
-    """Main function to process thesis using Referia data."""
+def main(save_config: bool = True, split_sections: bool = False):
+    """Main function to process thesis using Referia data.
+    
+    If save_config is set the generated configuration is also written to
+    thesis_config.yaml for inspection. If split_sections is set each section
+    is also written out as its own PDF and converted from there.
+    """
+    # Imported here so the PDF conversion functions don't pull in Referia
+    import referia as rf
+    
     # Load Referia data
     interface = rf.config.interface.Interface.from_file(
         directory=".",
@@ -230,10 +405,13 @@ def main():
     # Generate configuration
     config = generate_thesis_config(data, index)
     
+    section_configs = build_section_config(config)
+    
     # Save configuration to YAML
-    config_path = "thesis_config.yaml"
-    with open(config_path, 'w') as f:
-        yaml.dump(config, f)
+    if save_config:
+        config_path = "thesis_config.yaml"
+        with open(config_path, 'w') as f:
+            yaml.dump(config, f, Dumper=SafeDumper)
     
     # Get thesis PDF path from Referia data
     pdf_path = data.at[index, 'ThesisPDF']
@@ -242,11 +420,16 @@ def main():
     pdf_output_dir = "pdf_chapters"
     txt_output_dir = "txt_output"
     
-    # Split PDF into sections
-    split_pdf(pdf_path, pdf_output_dir, config)
-    
-    # Process each section to text
-    process_directory(pdf_output_dir, txt_output_dir, config_path)
+    if split_sections:
+        # Split PDF into sections
+        split_pdf(pdf_path, pdf_output_dir, config)
+        
+        # Process each section to text
+        process_directory(pdf_output_dir, txt_output_dir,
+                          section_configs=section_configs)
+    else:
+        # Process each section to text directly from the thesis PDF
+        sections_to_txt(pdf_path, txt_output_dir, config, section_configs)
 
 if __name__ == "__main__":
     main()
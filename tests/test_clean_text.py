@@ -0,0 +1,71 @@
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+# Lets pdf-to-llm.py (and these tests) import the optional _wrap extension
+sys.path.insert(0, str(REPO_ROOT))
+
+_spec = importlib.util.spec_from_file_location("pdf_to_llm", REPO_ROOT / "pdf-to-llm.py")
+pdf_to_llm = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(pdf_to_llm)
+
+
+@pytest.fixture
+def python_wrap(monkeypatch):
+    """Force wrap_text onto its pure Python implementation."""
+    monkeypatch.setattr(pdf_to_llm, "_compiled_wrap_text", None)
+
+
+def regex_clean_text(text):
+    """clean_text as computed by the Unicode regex path, for any input."""
+    text = pdf_to_llm._SPECIAL_WS_RE.sub(pdf_to_llm._replace_special_ws, text)
+    return pdf_to_llm.wrap_text(text.strip())
+
+
+def clean_text_both_paths(text):
+    """Check the ASCII fast path against the regex path and return the result."""
+    result = pdf_to_llm.clean_text(text)
+    assert result == regex_clean_text(text)
+    return result
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('a\x1cb', 'a b'),
+    ('a\x1fb c', 'a b c'),
+    ('word , next .', 'word, next.'),
+    ('a \t\n ;b', 'a;b'),
+    ('a # b', 'a b'),
+    ('a#b', 'ab'),
+    (' \n\t ', ''),
+    ('', ''),
+])
+def test_clean_text_examples(python_wrap, text, expected):
+    assert clean_text_both_paths(text) == expected
+
+
+@pytest.mark.parametrize("code", range(128))
+def test_ascii_character_between_words(python_wrap, code):
+    char = chr(code)
+    for text in (f'a{char}b', f'a {char}b', f'a{char} .b', f'a{char}{char}, b'):
+        clean_text_both_paths(text)
+
+
+def test_random_ascii_matches_regex_path(python_wrap):
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = ''.join(chr(rng.randrange(128)) for _ in range(rng.randrange(400)))
+        clean_text_both_paths(text)
+
+
+def test_compiled_wrap_matches_python(python_wrap):
+    _wrap = pytest.importorskip("_wrap")
+    rng = random.Random(0)
+    alphabet = 'abcdefgh  \t\x0c\x1c\xa0\né[Page 3]'
+    for _ in range(2000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(400)))
+        width = rng.choice([1, 5, 30, 80])
+        assert _wrap.wrap_text(text, width) == pdf_to_llm.wrap_text(text, width)